@@ -1 +1,6 @@
-from . import agent
\ No newline at end of file
+from dotenv import load_dotenv
+
+# Load environment variables once, before any submodule reads os.environ
+load_dotenv()
+
+from . import agent
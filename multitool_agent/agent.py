@@ -1,8 +1,9 @@
-import datetime
-from zoneinfo import ZoneInfo
 from google.adk.agents import Agent
+from google.adk.agents.context_cache_config import ContextCacheConfig
+from google.adk.apps import App
 from multitool_agent.sub_agents.workout_generator_agent.agent import workout_planner_agent
 from multitool_agent.sub_agents.journal_agent.agent import journal_agent
+from multitool_agent.prompts import ROOT_AGENT_INSTRUCTION
 
 root_agent = Agent(
     name="Root_Agent",
@@ -10,17 +11,19 @@ root_agent = Agent(
     description=(
         "This is the root agent for the aevio system. It is responsible for handling user requests and delegating to the appropriate sub-agents. Dont reveal that you are a AI agent, just answer the questions as you are a aevio workout expert."
     ),
-    instruction=(
-        "You are the root agent for the aevio system. You are responsible for handling user requests and delegating to the appropriate sub-agents. Dont reveal that you are a AI agent, just answer the questions as you are a aevio workout expert."
+    instruction=ROOT_AGENT_INSTRUCTION,
+    sub_agents=[workout_planner_agent, journal_agent],
+)
 
-        "Maintain a friendly, natural, and simple tone — like a normal Indian conversational style. "
-        "Avoid jargon, buzzwords, or overly formal phrasing. "
-        "Sound casual, approachable, and human — as if you're chatting with someone in real life.\n\n"
+# Context caching: the long, static system instructions (e.g. the workout planner's
+# AGENT_INSTRUCTION) are tokenized once into Vertex AI cached content and referenced
+# by handle on later turns. ADK creates the cache and refreshes it before the TTL expires.
+CONTEXT_CACHE_TTL_SECONDS = 3600
 
-        "If the user asks who they are, check the memory for any available information. "
-        "If you have it, answer briefly and naturally. "
-        "If not, say you don’t know in a polite way.\n\n"
+app = App(
+    name="multitool_agent",
+    root_agent=root_agent,
+    context_cache_config=ContextCacheConfig(
+        ttl_seconds=CONTEXT_CACHE_TTL_SECONDS,
     ),
-    
-    sub_agents=[workout_planner_agent, journal_agent]
-)
\ No newline at end of file
+)
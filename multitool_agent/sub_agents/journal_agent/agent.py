@@ -2,12 +2,21 @@
 Journal Agent - Saves and retrieves journal entries from the Vertex AI Memory Bank.
 """
 
+import asyncio
+import atexit
+import functools
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
 from google.adk.agents import Agent
-import vertexai
 import os
-from dotenv import load_dotenv
-from typing import Dict
-load_dotenv()
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    import vertexai
 
 PROJECT_ID = os.environ.get("GOOGLE_CLOUD_PROJECT")
 LOCATION = os.environ.get("GOOGLE_CLOUD_LOCATION")
@@ -15,108 +24,287 @@ AGENT_ENGINE_ID = os.environ.get("AGENT_ENGINE_ID")
 AGENT_ENGINE_NAME = f"projects/{PROJECT_ID}/locations/{LOCATION}/reasoningEngines/{AGENT_ENGINE_ID}"
 DEFAULT_USER_ID = "journal_user_opaque_id"
 APP_NAME = "aevio_memory_bank"  # Must match across save and retrieve
-client = vertexai.Client(project=PROJECT_ID, location=LOCATION)
+logger = logging.getLogger(__name__)
+
+# Distinct scopes for separation [1-3]
+# Curated Facts: Used for agent interaction (consolidation enabled)
+# IMPORTANT: app_name must be included for retrieval to work correctly
+CURATED_FACTS_SCOPE: Dict[str, str] = {"app_name": APP_NAME, "user_id": DEFAULT_USER_ID}
+# Raw Archive: Used for static storage (bypasses consolidation)
+RAW_ARCHIVE_SCOPE: Dict[str, str] = {"app_name": APP_NAME, "user_id": DEFAULT_USER_ID, "data_type": "raw_archive"}
+# Both scopes need their own copy of the entry text: memories.create takes a single
+# scope dict, and memories.generate cannot reference an existing memory by ID, so
+# the two writes cannot be merged into one upload.
+# Maximum number of raw archive writes in flight during a batch save
+MAX_CONCURRENT_ARCHIVE_WRITES = 8
+# Page size used when listing journal entries from the memory bank
+RETRIEVE_PAGE_SIZE = 100
+
+@functools.lru_cache(maxsize=1)
+def _get_vertex_client() -> "vertexai.Client":
+    """
+    Return the shared Vertex AI client, creating it on first use.
+
+    vertexai is imported here rather than at module load so agent startup does
+    not pay for it; the client is then reused by every journal tool.
+    """
+    import vertexai
+
+    return vertexai.Client(project=PROJECT_ID, location=LOCATION)
+
+# Background workers that dispatch GenerateMemories off the request path.
+# Shut down with wait=True at exit so queued generations still get sent.
+_bg_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="journal_memory_generate")
+atexit.register(_bg_executor.shutdown, wait=True)
+
+def _log_generation_failure(future: Future) -> None:
+    """Logs a failed background GenerateMemories dispatch, since no caller awaits it."""
+    error = future.exception()
+    if error is not None:
+        logger.error("Error during curated memory generation: %s", error)
+
+def _queue_curated_generation(events: List[Dict]) -> None:
+    """Queues GenerateMemories for the given events on the background executor."""
+    future = _bg_executor.submit(
+        _get_vertex_client().agent_engines.memories.generate,
+        name=AGENT_ENGINE_NAME,
+        direct_contents_source={"events": events}, # Provide raw text as source [6]
+        scope=CURATED_FACTS_SCOPE,
+        config={"wait_for_completion": False} # Run asynchronously for production agents [5]
+    )
+    future.add_done_callback(_log_generation_failure)
+    # Invalidate now, and again once the dispatch returns so the no-cache window
+    # runs from when the server actually started generating
+    _invalidate_retrieval_cache()
+    future.add_done_callback(lambda _: _invalidate_retrieval_cache())
+
+def _format_journal_entry(idx: int, retrieved_memory) -> str:
+    """Formats a single retrieved memory as a numbered, timestamped journal entry."""
+    memory = retrieved_memory.memory
+    fact = getattr(memory, "fact", None) or "[No content]"
+    update_time = getattr(memory, "update_time", None)
+    timestamp = update_time.isoformat() if update_time else "unknown timestamp"
+    return f"Entry {idx} ({timestamp}):\n{fact}"
+
+# Retrieval cache: the agent often repeats the same lookup within a conversation.
+# Results are kept in a small TTL + LRU cache keyed by the normalized query, and
+# invalidated whenever a new entry is saved.
+RETRIEVAL_CACHE_TTL_SECONDS = 300
+RETRIEVAL_CACHE_MAX_ENTRIES = 256
+# GenerateMemories keeps running server-side after a save returns, so nothing is
+# cached for this long afterwards; otherwise a read right after a save would pin
+# the pre-generation results for the full TTL.
+RETRIEVAL_CACHE_SAVE_GRACE_SECONDS = 60
+
+_retrieval_cache: "OrderedDict[Tuple[str, int], Tuple[float, str]]" = OrderedDict()
+_retrieval_cache_lock = threading.Lock()
+_retrieval_cache_resume_at = 0.0
 
-def get_journal_entry() -> str:
+def _normalize_query(search_query: Optional[str]) -> str:
+    """Lowercases the query and collapses whitespace; word order is kept, since it affects ranking."""
+    if not search_query:
+        return ""
+    return " ".join(search_query.lower().split())
+
+def _get_cached_retrieval(key: Tuple[str, int]) -> Optional[str]:
+    """Returns the cached retrieval result for key if it has not expired."""
+    with _retrieval_cache_lock:
+        cached = _retrieval_cache.get(key)
+        if cached is None:
+            return None
+        cached_at, result = cached
+        if time.monotonic() - cached_at >= RETRIEVAL_CACHE_TTL_SECONDS:
+            del _retrieval_cache[key]
+            return None
+        _retrieval_cache.move_to_end(key)
+        return result
+
+def _set_cached_retrieval(key: Tuple[str, int], result: str) -> None:
+    """Stores a retrieval result, evicting the least recently used entry when full."""
+    with _retrieval_cache_lock:
+        if time.monotonic() < _retrieval_cache_resume_at:
+            return
+        _retrieval_cache[key] = (time.monotonic(), result)
+        _retrieval_cache.move_to_end(key)
+        while len(_retrieval_cache) > RETRIEVAL_CACHE_MAX_ENTRIES:
+            _retrieval_cache.popitem(last=False)
+
+def _invalidate_retrieval_cache() -> None:
+    """Drops every cached retrieval and stops caching until generation has had time to land."""
+    global _retrieval_cache_resume_at
+    with _retrieval_cache_lock:
+        _retrieval_cache.clear()
+        _retrieval_cache_resume_at = time.monotonic() + RETRIEVAL_CACHE_SAVE_GRACE_SECONDS
+
+def get_journal_entry(search_query: Optional[str] = None, limit: int = 50) -> str:
     """
     This function gets journal entries from the memory bank using the user's opaque id.
     Uses the same client as save_journal_entry to avoid API key conflicts.
+    Pass a search_query (e.g. "sleep last week") to get the most relevant entries,
+    or leave it empty to list entries. At most `limit` entries are returned.
     """
+    normalized_query = _normalize_query(search_query)
+    if not normalized_query:
+        search_query = None
+    cache_key = (normalized_query, limit)
+    cached = _get_cached_retrieval(cache_key)
+    if cached is not None:
+        return cached
+
     try:
-        # Use the same scope as save_journal_entry for consistency
-        scope = {"app_name": APP_NAME, "user_id": DEFAULT_USER_ID}
+        client = _get_vertex_client()
+
+        if search_query:
+            retrieved_memories = client.agent_engines.memories.retrieve(
+                name=AGENT_ENGINE_NAME,
+                scope=CURATED_FACTS_SCOPE,
+                similarity_search_params={"search_query": search_query, "top_k": max(limit, 1)}
+            )
+        else:
+            # Simple retrieval lists every memory in the scope page by page, without
+            # scoring each one against a wildcard similarity query.
+            retrieved_memories = client.agent_engines.memories.retrieve(
+                name=AGENT_ENGINE_NAME,
+                scope=CURATED_FACTS_SCOPE,
+                simple_retrieval_params={"page_size": min(max(limit, 1), RETRIEVE_PAGE_SIZE)}
+            )
+        # Stop paging once the limit is reached
+        retrieved_memories = islice(retrieved_memories, max(limit, 0))
         
-        # Use client.agent_engines.memories.retrieve() - same client used for saving
-        retrieved_memories = client.agent_engines.memories.retrieve(
-            name=AGENT_ENGINE_NAME,
-            scope=scope,
-            similarity_search_params={"search_query": "*"}
+        # Format the retrieved memories straight into the joined result
+        body = "\n\n".join(
+            _format_journal_entry(idx, retrieved_memory)
+            for idx, retrieved_memory in enumerate(retrieved_memories, start=1)
         )
         
-        # Process the retrieved memories
-        formatted_entries = []
-        for idx, retrieved_memory in enumerate(retrieved_memories, start=1):
-            memory = retrieved_memory.memory
-            fact = getattr(memory, "fact", None) or "[No content]"
-            update_time = getattr(memory, "update_time", None)
-            timestamp = update_time.isoformat() if update_time else "unknown timestamp"
-            formatted_entries.append(f"Entry {idx} ({timestamp}):\n{fact}")
-        
-        if not formatted_entries:
-            return "No journal entries found."
-        
-        return "\n\n".join(formatted_entries)
+        result = body or "No journal entries found."
+        _set_cached_retrieval(cache_key, result)
+        return result
         
     except Exception as error:
         return f"Error fetching journal entries: {error}"
 
-def save_journal_entry(entry: str) -> str:
+async def save_journal_entry(entry: str) -> str:
     """
     This function saves a journal entry to the memory bank using two separate scopes:
     1. GenerateMemories: For intelligent, consolidated facts (runs asynchronously).
     2. CreateMemory: For raw, archival storage (runs synchronously).
+    GenerateMemories is queued on a background worker, so the save only waits for the archive write.
     """
     
     # Ensure necessary context variables are available
-    if not client or not AGENT_ENGINE_NAME:
-        return "Error: Vertex AI Client or Agent Engine Name not initialized."
-    
-    # 1. Define the distinct scopes for separation [1-3]
-    # Curated Facts: Used for agent interaction (consolidation enabled)
-    # IMPORTANT: app_name must be included for retrieval to work correctly
-    CURATED_FACTS_SCOPE: Dict[str, str] = {"app_name": APP_NAME, "user_id": DEFAULT_USER_ID}
-    # Raw Archive: Used for static storage (bypasses consolidation)
-    RAW_ARCHIVE_SCOPE: Dict[str, str] = {"app_name": APP_NAME, "user_id": DEFAULT_USER_ID, "data_type": "raw_archive"}
+    try:
+        client = _get_vertex_client()
+    except Exception as error:
+        return f"Error: Vertex AI Client not initialized: {error}"
     
-    curated_status = ""
-    archive_status = ""
+    # Prepare the journal entry as content events [6]
+    events = [
+        {
+            "content": {
+                "role": "user",
+                "parts": [{"text": entry}]
+            }
+        }
+    ]
 
     # --- 1. GENERATE CURATED MEMORIES (Extraction + Consolidation) ---
-    # This process is a long-running operation [4]. We run it asynchronously [5].
+    # This process is a long-running operation [4]. Even the dispatch is moved off the
+    # request path; failures are logged by the background worker [5, 6, 7].
     try:
-        # Prepare the journal entry as content events [6]
-        events = [
-            {
-                "content": {
-                    "role": "user",
-                    "parts": [{"text": entry}]
-                }
-            }
-        ]
-
-        # Trigger GenerateMemories for extraction and consolidation [6, 7]
-        client.agent_engines.memories.generate(
-            name=AGENT_ENGINE_NAME,
-            direct_contents_source={"events": events}, # Provide raw text as source [6]
-            scope=CURATED_FACTS_SCOPE,
-            config={"wait_for_completion": False} # Run asynchronously for production agents [5]
-        )
-        curated_status = "Curated facts generation triggered asynchronously."
-
-    except Exception as e:
-        curated_status = f"Error during curated memory generation: {e}"
-
+        _queue_curated_generation(events)
+        curated_status = "Curated facts generation queued."
+    except RuntimeError as error:
+        curated_status = f"Error during curated memory generation: {error}"
 
     # --- 2. CREATE RAW ARCHIVE (Direct Storage) ---
     # This uploads the full text directly, bypassing extraction and consolidation [8].
     try:
         # Call CreateMemory [8, 9]
-        client.agent_engines.memories.create(
+        await asyncio.to_thread(
+            client.agent_engines.memories.create,
             name=AGENT_ENGINE_NAME,
             fact=entry, # Store the full raw text as the fact [8]
             scope=RAW_ARCHIVE_SCOPE # Use the distinct archival scope [8]
         )
         archive_status = "Raw journal archive saved successfully (not consolidated)."
-
-    except Exception as e:
-        archive_status = f"Error during raw memory creation: {e}"
+    except Exception as error:
+        archive_status = f"Error during raw memory creation: {error}"
 
     return f"Journal entry saving complete. Curated status: {curated_status}. Archive status: {archive_status}"
 
+async def batch_save_journal_entries(entries: List[str]) -> str:
+    """
+    This function saves several journal entries at once. Use it instead of calling
+    save_journal_entry repeatedly when the user shares multiple entries together.
+    1. GenerateMemories: One call with every entry as a separate event (queued in the background).
+    2. CreateMemory: One raw archive write per entry, sent concurrently.
+    The result reports the archive status of each entry so partial failures are visible.
+    """
+
+    # Ensure necessary context variables are available
+    try:
+        client = _get_vertex_client()
+    except Exception as error:
+        return f"Error: Vertex AI Client not initialized: {error}"
+
+    # Blank entries are skipped, but statuses keep the caller's 1-based positions
+    to_save = [(idx, entry) for idx, entry in enumerate(entries, start=1) if entry and entry.strip()]
+    if not to_save:
+        return "No journal entries provided."
+
+    # Every entry becomes its own content event in a single GenerateMemories request [6]
+    events = [
+        {
+            "content": {
+                "role": "user",
+                "parts": [{"text": entry}]
+            }
+        }
+        for _, entry in to_save
+    ]
+
+    archive_slots = asyncio.Semaphore(MAX_CONCURRENT_ARCHIVE_WRITES)
+
+    async def archive(entry: str):
+        async with archive_slots:
+            return await asyncio.to_thread(
+                client.agent_engines.memories.create,
+                name=AGENT_ENGINE_NAME,
+                fact=entry,
+                scope=RAW_ARCHIVE_SCOPE
+            )
+
+    try:
+        _queue_curated_generation(events)
+        curated_status = f"Curated facts generation queued for {len(to_save)} entries."
+    except RuntimeError as error:
+        curated_status = f"Error during curated memory generation: {error}"
+
+    archive_results = await asyncio.gather(
+        *(archive(entry) for _, entry in to_save),
+        return_exceptions=True,
+    )
+
+    statuses = {idx: "skipped (empty)." for idx in range(1, len(entries) + 1)}
+    saved_count = 0
+    for (idx, _), result in zip(to_save, archive_results):
+        if isinstance(result, BaseException):
+            statuses[idx] = f"Error during raw memory creation: {result}"
+        else:
+            saved_count += 1
+            statuses[idx] = "Raw journal archive saved successfully."
+    archive_lines = [f"Entry {idx}: {status}" for idx, status in statuses.items()]
+
+    return (
+        f"Batch journal save complete. Curated status: {curated_status}. "
+        f"Archive status: {saved_count}/{len(to_save)} entries saved.\n" + "\n".join(archive_lines)
+    )
+
 journal_agent = Agent(
     name="journal_agent",
     model="gemini-2.5-flash",
     description="This agent is responsible for saving a journal entry to the memory bank.",
     instruction="You are a journal agent. You are responsible for saving a journal entry to the memory bank.",
-    tools=[get_journal_entry, save_journal_entry],
+    tools=[get_journal_entry, save_journal_entry, batch_save_journal_entries],
 )
@@ -11,6 +11,7 @@ from google.adk.agents import Agent
 
 from .schemas import AI_WORKOUT_GENERATION_CONTEXT, WorkoutPlan
 from .tools import (
+    clear_user_info_cache,
     fetch_user_info,
     format_workout_plan_for_review,
     format_workout_week_details,
@@ -159,6 +160,7 @@ workout_planner_agent = Agent(  # type: ignore[call-arg]
     instruction=AGENT_INSTRUCTION,
     tools=[
         fetch_user_info,
+        clear_user_info_cache,  # Refresh profile after the user updates it
         generate_workout_plan_ids,
         get_workout_schema_info,
         validate_workout_plan,
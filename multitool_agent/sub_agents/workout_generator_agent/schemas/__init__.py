@@ -34,6 +34,7 @@ from .workout_plan import (
     AI_WORKOUT_GENERATION_CONTEXT,
     # Helper Functions
     get_example_workout_plan,
+    get_example_workout_plan_json,
 )
 
 __all__ = [
@@ -66,5 +67,6 @@ __all__ = [
     "AI_WORKOUT_GENERATION_CONTEXT",
     # Helper Functions
     "get_example_workout_plan",
+    "get_example_workout_plan_json",
 ]
 
@@ -19,10 +19,13 @@ IMPORTANT FOR AI GENERATION:
 
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Literal, Optional, Union
+import sys
+from functools import cached_property
+from typing import Annotated, Literal, Optional, Union
 
-from pydantic import BaseModel, Field
+from pydantic import AfterValidator, BaseModel, ConfigDict, Field
+from pydantic.alias_generators import to_camel
+from pydantic_core import from_json, to_json
 
 
 # ============================================================================
@@ -36,220 +39,222 @@ SetType = Literal["warmup", "working", "dropset", "failure", "backoff"]
 FeedbackType = Literal["too_easy", "too_hard", "injury", "missed", "completed"]
 
 
+def _intern_all(values: list[str]) -> list[str]:
+    """Intern tag strings so the few distinct values repeated across a plan share one object."""
+    return [sys.intern(value) for value in values]
+
+
+# Muscle group / equipment names: a small vocabulary repeated on every exercise and day
+TagList = Annotated[list[str], AfterValidator(_intern_all)]
+
+
+# ============================================================================
+# Base Model
+# ============================================================================
+
+
+class _PlanModel(BaseModel):
+    """
+    Base for workout plan models: every field gets a camelCase alias generated
+    from its attribute name, and accepts either.
+
+    Models are frozen because the tools share one validated instance between
+    the validate, review and save calls.
+
+    PreviousRecord, PersonalRecord and FeedbackEntry are only ever validated
+    nested inside WorkoutPlan, so they set defer_build=True and their standalone
+    validators are not built at import. AIContext and ProgressTracker are built
+    eagerly: WorkoutPlan creates them through default_factory whenever a plan
+    omits aiContext/progress, which would otherwise compile them on a request.
+    """
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True, extra="ignore", frozen=True)
+
+
 # ============================================================================
 # Set & Exercise Models
 # ============================================================================
 
 
-class ActualPerformance(BaseModel):
+class ActualPerformance(_PlanModel):
     """Logged performance data for a completed set."""
 
     reps: int = Field(..., description="Actual reps performed")
     weight: float = Field(..., description="Actual weight used in kg")
     rpe: int = Field(..., ge=1, le=10, description="Rate of Perceived Exertion 1-10")
-    completed_at: str = Field(..., alias="completedAt", description="ISO 8601 timestamp")
+    completed_at: str = Field(..., description="ISO 8601 timestamp")
     notes: Optional[str] = None
 
-    class Config:
-        populate_by_name = True
 
-
-class ExerciseSet(BaseModel):
+class ExerciseSet(_PlanModel):
     """A single set within an exercise."""
 
-    set_number: int = Field(..., alias="setNumber", ge=1, description="Set number starting from 1")
+    set_number: int = Field(..., ge=1, description="Set number starting from 1")
     type: SetType = Field(..., description="Type of set: warmup, working, dropset, failure, backoff")
     target_reps: Union[int, str] = Field(
-        ..., alias="targetReps", description="Target reps (number) or range ('8-12') or 'AMRAP'"
+        ..., description="Target reps (number) or range ('8-12') or 'AMRAP'"
     )
     target_weight: Optional[Union[int, float, str]] = Field(
-        None, alias="targetWeight", description="Target weight in kg, or 'bodyweight', or 'RPE 8'"
+        None, description="Target weight in kg, or 'bodyweight', or 'RPE 8'"
     )
-    target_rpe: Optional[int] = Field(None, alias="targetRpe", ge=1, le=10, description="Target RPE 1-10")
+    target_rpe: Optional[int] = Field(None, ge=1, le=10, description="Target RPE 1-10")
     actual: Optional[ActualPerformance] = Field(None, description="Logged performance (null until completed)")
 
-    class Config:
-        populate_by_name = True
-
 
-class MuscleGroups(BaseModel):
+class MuscleGroups(_PlanModel):
     """Primary and secondary muscle groups targeted."""
 
-    primary: list[str] = Field(..., description="Primary muscles: chest, back, legs, shoulders, arms, abs, etc.")
-    secondary: list[str] = Field(default_factory=list, description="Secondary/stabilizer muscles")
+    primary: TagList = Field(..., description="Primary muscles: chest, back, legs, shoulders, arms, abs, etc.")
+    secondary: TagList = Field(default_factory=list, description="Secondary/stabilizer muscles")
 
 
-class Exercise(BaseModel):
+class Exercise(_PlanModel):
     """A single exercise with sets and coaching info."""
 
     id: str = Field(..., description="Unique ID, e.g., 'ex_bench_1'")
     name: str = Field(..., description="Exercise name, e.g., 'Barbell Bench Press'")
-    equipment: list[str] = Field(
+    equipment: TagList = Field(
         default_factory=list, description="Required equipment: barbell, dumbbells, cable, bodyweight, etc."
     )
-    muscle_groups: MuscleGroups = Field(..., alias="muscleGroups")
+    muscle_groups: MuscleGroups
     sets: list[ExerciseSet] = Field(..., min_length=1, description="List of sets for this exercise")
-    rest_between_sets: int = Field(..., alias="restBetweenSets", ge=0, description="Rest time in seconds between sets")
+    rest_between_sets: int = Field(..., ge=0, description="Rest time in seconds between sets")
     tempo: Optional[str] = Field(None, description="Tempo notation: 'eccentric-pause-concentric-pause', e.g., '3-1-2-0'")
     notes: Optional[str] = Field(None, description="Exercise-specific notes or modifications")
-    video_url: Optional[str] = Field(None, alias="videoUrl", description="URL to exercise demonstration video")
+    video_url: Optional[str] = Field(None, description="URL to exercise demonstration video")
     alternatives: list[str] = Field(default_factory=list, description="Alternative exercise names if equipment unavailable")
     cues: list[str] = Field(default_factory=list, description="Form cues for proper execution")
     common_mistakes: list[str] = Field(
-        default_factory=list, alias="commonMistakes", description="Common mistakes to avoid"
+        default_factory=list, description="Common mistakes to avoid"
     )
 
-    class Config:
-        populate_by_name = True
-
 
-class ExerciseBlock(BaseModel):
+class ExerciseBlock(_PlanModel):
     """A block of exercises (can be superset, circuit, or straight sets)."""
 
     id: str = Field(..., description="Unique ID, e.g., 'block_1'")
     type: BlockType = Field(..., description="Block type: straight, superset, circuit, emom, amrap")
     exercises: list[Exercise] = Field(..., min_length=1, description="Exercises in this block")
     rest_between_rounds: Optional[int] = Field(
-        None, alias="restBetweenRounds", description="Rest between rounds/circuits in seconds"
+        None, description="Rest between rounds/circuits in seconds"
     )
     rounds: Optional[int] = Field(None, ge=1, description="Number of rounds for circuits")
 
-    class Config:
-        populate_by_name = True
-
 
 # ============================================================================
 # Day & Week Models
 # ============================================================================
 
 
-class WorkoutDay(BaseModel):
+class WorkoutDay(_PlanModel):
     """A single workout day."""
 
     id: str = Field(..., description="Unique ID, e.g., 'day_1_push'")
-    day_number: int = Field(..., alias="dayNumber", ge=1, le=7, description="Day number 1-7")
+    day_number: int = Field(..., ge=1, le=7, description="Day number 1-7")
     name: str = Field(..., description="Day name, e.g., 'Push Day A', 'Upper Body', 'Full Body'")
-    target_duration: int = Field(..., alias="targetDuration", ge=0, description="Target duration in minutes")
-    muscle_groups: list[str] = Field(..., alias="muscleGroups", description="Main muscle groups trained this day")
+    target_duration: int = Field(..., ge=0, description="Target duration in minutes")
+    muscle_groups: TagList = Field(..., description="Main muscle groups trained this day")
     warmup: Optional[ExerciseBlock] = Field(None, description="Optional warmup block")
     blocks: list[ExerciseBlock] = Field(default_factory=list, description="Main workout blocks")
     cooldown: Optional[ExerciseBlock] = Field(None, description="Optional cooldown block")
-    rest_day: bool = Field(False, alias="restDay", description="True if this is a rest/recovery day")
+    rest_day: bool = Field(False, description="True if this is a rest/recovery day")
     notes: Optional[str] = Field(None, description="Day-specific notes or focus points")
 
-    class Config:
-        populate_by_name = True
-
 
-class Week(BaseModel):
+class Week(_PlanModel):
     """A week of training."""
 
-    week_number: int = Field(..., alias="weekNumber", ge=1, description="Week number in the program")
+    week_number: int = Field(..., ge=1, description="Week number in the program")
     focus: str = Field(..., description="Week focus: 'Volume', 'Intensity', 'Strength', 'Deload', etc.")
-    is_deload: bool = Field(False, alias="isDeload", description="True if this is a deload/recovery week")
+    is_deload: bool = Field(False, description="True if this is a deload/recovery week")
     days: list[WorkoutDay] = Field(..., min_length=1, max_length=7, description="Workout days for this week")
 
-    class Config:
-        populate_by_name = True
-
 
 # ============================================================================
 # Phase & Program Models
 # ============================================================================
 
 
-class Phase(BaseModel):
+class Phase(_PlanModel):
     """A training phase (mesocycle)."""
 
     id: str = Field(..., description="Unique ID, e.g., 'phase_foundation'")
     name: str = Field(..., description="Phase name: 'Foundation', 'Hypertrophy', 'Strength', 'Peak', 'Deload'")
     objective: str = Field(..., description="Phase objective/goal description")
-    week_start: int = Field(..., alias="weekStart", ge=1, description="Starting week number")
-    week_end: int = Field(..., alias="weekEnd", ge=1, description="Ending week number")
+    week_start: int = Field(..., ge=1, description="Starting week number")
+    week_end: int = Field(..., ge=1, description="Ending week number")
     weeks: list[Week] = Field(..., min_length=1, description="Weeks in this phase")
 
-    class Config:
-        populate_by_name = True
-
 
 # ============================================================================
 # AI Context & Tracking Models
 # ============================================================================
 
 
-class AIContext(BaseModel):
+class AIContext(_PlanModel):
     """Context for AI generation and adaptation."""
 
     user_profile_snapshot: dict = Field(
-        default_factory=dict, alias="userProfileSnapshot", description="User profile at generation time"
+        default_factory=dict, description="User profile at generation time"
     )
-    generation_prompt: str = Field(default="", alias="generationPrompt", description="The prompt used to generate this plan")
-    model_version: str = Field(default="1.0", alias="modelVersion", description="AI model version used")
-
-    class Config:
-        populate_by_name = True
+    generation_prompt: str = Field(default="", description="The prompt used to generate this plan")
+    model_version: str = Field(default="1.0", description="AI model version used")
 
 
-class PreviousRecord(BaseModel):
+class PreviousRecord(_PlanModel):
     """Previous personal record data."""
 
+    model_config = ConfigDict(defer_build=True)
+
     weight: float
     reps: int
-    achieved_at: str = Field(..., alias="achievedAt")
-
-    class Config:
-        populate_by_name = True
+    achieved_at: str
 
 
-class PersonalRecord(BaseModel):
+class PersonalRecord(_PlanModel):
     """Personal record for an exercise."""
 
-    exercise_name: str = Field(..., alias="exerciseName")
+    model_config = ConfigDict(defer_build=True)
+
+    exercise_name: str
     weight: float = Field(..., description="Weight in kg")
     reps: int = Field(..., ge=1)
-    achieved_at: str = Field(..., alias="achievedAt", description="ISO 8601 timestamp")
-    previous_record: Optional[PreviousRecord] = Field(None, alias="previousRecord")
-
-    class Config:
-        populate_by_name = True
+    achieved_at: str = Field(..., description="ISO 8601 timestamp")
+    previous_record: Optional[PreviousRecord] = None
 
 
-class FeedbackEntry(BaseModel):
+class FeedbackEntry(_PlanModel):
     """User feedback entry for AI adaptation."""
 
+    model_config = ConfigDict(defer_build=True)
+
     id: str
     date: str = Field(..., description="ISO 8601 timestamp")
     type: FeedbackType
-    workout_day_id: str = Field(..., alias="workoutDayId")
+    workout_day_id: str
     notes: Optional[str] = None
-    ai_suggestion: Optional[str] = Field(None, alias="aiSuggestion", description="AI response to feedback")
+    ai_suggestion: Optional[str] = Field(None, description="AI response to feedback")
 
-    class Config:
-        populate_by_name = True
 
-
-class ProgressTracker(BaseModel):
+class ProgressTracker(_PlanModel):
     """Tracks user progress through the program."""
 
-    started_at: Optional[str] = Field(default=None, alias="startedAt", description="ISO 8601 timestamp when started")
-    current_week: int = Field(default=1, alias="currentWeek", ge=1)
-    current_day: int = Field(default=1, alias="currentDay", ge=1)
+    started_at: Optional[str] = Field(default=None, description="ISO 8601 timestamp when started")
+    current_week: int = Field(default=1, ge=1)
+    current_day: int = Field(default=1, ge=1)
     completed_workouts: list[str] = Field(
-        default_factory=list, alias="completedWorkouts", description="List of completed workout day IDs"
+        default_factory=list, description="List of completed workout day IDs"
     )
-    personal_records: dict[str, PersonalRecord] = Field(default_factory=dict, alias="personalRecords")
+    personal_records: dict[str, PersonalRecord] = Field(default_factory=dict)
     feedback: list[FeedbackEntry] = Field(default_factory=list)
 
-    class Config:
-        populate_by_name = True
-
 
 # ============================================================================
 # Main Workout Plan Model
 # ============================================================================
 
 
-class WorkoutPlan(BaseModel):
+class WorkoutPlan(_PlanModel):
     """
     Complete workout plan schema.
 
@@ -271,29 +276,38 @@ class WorkoutPlan(BaseModel):
     # Metadata
     id: str = Field(..., description="Unique plan ID, e.g., 'wrk_abc123'")
     version: int = Field(1, ge=1, description="Schema version for migrations")
-    generated_at: str = Field(..., alias="generatedAt", description="ISO 8601 timestamp")
-    plan_type: PlanType = Field(..., alias="planType", description="single, weekly, or program")
+    generated_at: str = Field(..., description="ISO 8601 timestamp")
+    plan_type: PlanType = Field(..., description="single, weekly, or program")
 
     # Program Info
     name: str = Field(..., description="Plan name, e.g., '12-Week Strength Builder'")
     description: str = Field(..., description="Plan description and overview")
-    duration_weeks: int = Field(..., alias="durationWeeks", ge=1, le=52, description="Total program duration in weeks")
+    duration_weeks: int = Field(..., ge=1, le=52, description="Total program duration in weeks")
     difficulty: Difficulty = Field(..., description="beginner, intermediate, or advanced")
     goal: str = Field(
         ..., description="Primary goal: build_muscle, lose_weight, strength, endurance, general_fitness"
     )
 
     # AI Context
-    ai_context: AIContext = Field(default=AIContext(), alias="aiContext")
+    ai_context: AIContext = Field(default_factory=AIContext)
 
     # Program Structure
     phases: list[Phase] = Field(..., min_length=1, description="Training phases/mesocycles")
 
     # Tracking (initialize with defaults for new plans)
-    progress: ProgressTracker = Field(default=ProgressTracker())
+    progress: ProgressTracker = Field(default_factory=ProgressTracker)
 
-    class Config:
-        populate_by_name = True
+    @cached_property
+    def structure_counts(self) -> tuple[int, int, int]:
+        """(weeks, days, exercises) across all phases; counted once per instance."""
+        total_weeks = total_days = total_exercises = 0
+        for phase in self.phases:
+            total_weeks += len(phase.weeks)
+            for week in phase.weeks:
+                total_days += len(week.days)
+                for day in week.days:
+                    total_exercises += sum(len(block.exercises) for block in day.blocks)
+        return total_weeks, total_days, total_exercises
 
 
 # ============================================================================
@@ -464,12 +478,12 @@ OUTPUT ONLY THE RAW JSON OBJECT. NO TEXT. NO EXPLANATIONS. NO MARKDOWN.
 """
 
 
-def get_example_workout_plan() -> dict:
-    """Returns an example workout plan as a dictionary for reference."""
+def _build_example_workout_plan() -> dict:
+    """Builds the example workout plan dictionary."""
     return {
         "id": "wrk_example_001",
         "version": 1,
-        "generatedAt": datetime.now().isoformat(),
+        "generatedAt": "2024-01-15T10:30:00Z",
         "planType": "program",
         "name": "4-Week Beginner Full Body",
         "description": "A beginner-friendly program focusing on fundamental movements and building exercise habits.",
@@ -572,3 +586,16 @@ def get_example_workout_plan() -> dict:
         },
     }
 
+
+# The example is documentation, not live data, so it is serialized once at import
+_EXAMPLE_WORKOUT_PLAN_JSON: str = to_json(_build_example_workout_plan(), indent=2).decode()
+
+
+def get_example_workout_plan() -> dict:
+    """Returns an example workout plan as a dictionary for reference."""
+    return from_json(_EXAMPLE_WORKOUT_PLAN_JSON)
+
+
+def get_example_workout_plan_json() -> str:
+    """Returns the example workout plan as pre-serialized, indented JSON."""
+    return _EXAMPLE_WORKOUT_PLAN_JSON
@@ -21,6 +21,7 @@ from .utils import (
 
 from .workout_tools import (
     fetch_user_info,
+    clear_user_info_cache,
     generate_workout_plan_ids,
     get_workout_schema_info,
     validate_workout_plan,
@@ -48,6 +49,7 @@ __all__ = [
     "parse_timestamp",
     # Workout tools
     "fetch_user_info",
+    "clear_user_info_cache",
     "generate_workout_plan_ids",
     "get_workout_schema_info",
     "validate_workout_plan",
@@ -4,10 +4,12 @@ Utility functions for workout plan generation.
 Provides ID generation, timestamp handling, and other helper functions.
 """
 
+import base64
+import functools
+import re
 import secrets
-import string
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Iterator, Optional
 
 
 def _generate_random_suffix(length: int = 8) -> str:
@@ -18,10 +20,28 @@ def _generate_random_suffix(length: int = 8) -> str:
         length: Length of the random string (default: 8)
         
     Returns:
-        Random alphanumeric string
+        Random lowercase alphanumeric string (base32 alphabet: a-z, 2-7)
     """
-    alphabet = string.ascii_lowercase + string.digits
-    return "".join(secrets.choice(alphabet) for _ in range(length))
+    # One urandom draw per suffix: every 5 random bytes encode to 8 base32 characters
+    num_bytes = (length * 5 + 7) // 8
+    return base64.b32encode(secrets.token_bytes(num_bytes)).decode("ascii").lower()[:length]
+
+
+def _suffix_pool(count: int, length: int = 8) -> Iterator[str]:
+    """
+    Yield `count` random suffixes sliced from a single urandom draw.
+    
+    Args:
+        count: Number of suffixes to produce
+        length: Length of each suffix (default: 8)
+        
+    Returns:
+        Iterator of random lowercase alphanumeric strings
+    """
+    count = max(count, 0)
+    encoded = base64.b32encode(secrets.token_bytes((count * length * 5 + 7) // 8)).decode("ascii").lower()
+    for start in range(0, count * length, length):
+        yield encoded[start:start + length]
 
 
 def generate_id(prefix: str, suffix: Optional[str] = None) -> str:
@@ -39,9 +59,9 @@ def generate_id(prefix: str, suffix: Optional[str] = None) -> str:
         
     Example:
         >>> generate_id("wrk")
-        'wrk_a1b2c3d4'
+        'wrk_k3xq7mza'
         >>> generate_id("ex", "bench")
-        'ex_bench_a1b2c3d4'
+        'ex_bench_m4tz2qle'
     """
     random_part = _generate_random_suffix()
     if suffix:
@@ -87,6 +107,10 @@ def generate_week_id(week_number: int) -> str:
     return generate_id(f"w{week_number}")
 
 
+# Runs of ID-safe characters; everything else (spaces, hyphens, brackets) separates words
+_NAME_WORDS = re.compile(r"[a-z0-9]+")
+
+
 def generate_day_id(week_number: int, day_number: int, day_name: Optional[str] = None) -> str:
     """
     Generate a unique workout day ID.
@@ -101,12 +125,12 @@ def generate_day_id(week_number: int, day_number: int, day_name: Optional[str] =
         
     Example:
         >>> generate_day_id(1, 1, "push")
-        'w1_d1_push_a1b2c3d4'
+        'w1_d1_push_r7dkw3xa'
     """
     prefix = f"w{week_number}_d{day_number}"
     if day_name:
         # Clean the day name for use in ID
-        clean_name = day_name.lower().replace(" ", "_")[:10]
+        clean_name = "_".join(_NAME_WORDS.findall(day_name.lower()))[:10]
         return generate_id(prefix, clean_name)
     return generate_id(prefix)
 
@@ -126,6 +150,28 @@ def generate_block_id(block_number: Optional[int] = None) -> str:
     return generate_id("block")
 
 
+# Common words dropped when shortening exercise names for IDs
+_SKIP_WORDS = frozenset({"the", "a", "an", "with", "and", "or", "to"})
+
+
+@functools.lru_cache(maxsize=512)
+def _short_exercise_name(exercise_name: str) -> str:
+    """
+    Create a short version of an exercise name for use in IDs.
+    
+    Exercise names recur across weeks and days, so results are cached.
+    
+    Args:
+        exercise_name: Full exercise name (e.g., 'Barbell Bench Press')
+        
+    Returns:
+        First two significant words joined by '_', at most 15 characters
+    """
+    # Take the first 2 significant words, skip common words
+    significant = [w for w in _NAME_WORDS.findall(exercise_name.lower()) if w not in _SKIP_WORDS][:2]
+    return "_".join(significant)[:15]
+
+
 def generate_exercise_id(exercise_name: Optional[str] = None) -> str:
     """
     Generate a unique exercise ID.
@@ -138,16 +184,10 @@ def generate_exercise_id(exercise_name: Optional[str] = None) -> str:
         
     Example:
         >>> generate_exercise_id("Barbell Bench Press")
-        'ex_bench_a1b2c3d4'
+        'ex_barbell_bench_p2vy6hjc'
     """
     if exercise_name:
-        # Create a short version of the exercise name
-        words = exercise_name.lower().split()
-        # Take first 2-3 significant words, skip common words
-        skip_words = {"the", "a", "an", "with", "and", "or", "to"}
-        significant = [w for w in words if w not in skip_words][:2]
-        short_name = "_".join(significant)[:15]
-        return generate_id("ex", short_name)
+        return generate_id("ex", _short_exercise_name(exercise_name))
     return generate_id("ex")
 
 
@@ -161,6 +201,11 @@ def generate_feedback_id() -> str:
     return generate_id("fb")
 
 
+def _iso_z(dt: datetime) -> str:
+    """Format a datetime as 'YYYY-MM-DDTHH:MM:SSZ' with plain integer formatting."""
+    return f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d}T{dt.hour:02d}:{dt.minute:02d}:{dt.second:02d}Z"
+
+
 def get_current_timestamp() -> str:
     """
     Get the current UTC timestamp in ISO 8601 format.
@@ -172,7 +217,7 @@ def get_current_timestamp() -> str:
         >>> get_current_timestamp()
         '2024-01-15T10:30:00Z'
     """
-    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    return _iso_z(datetime.now(timezone.utc))
 
 
 def get_timestamp_for_date(
@@ -198,7 +243,7 @@ def get_timestamp_for_date(
         ISO 8601 formatted timestamp string with Z suffix
     """
     dt = datetime(year, month, day, hour, minute, second, tzinfo=timezone.utc)
-    return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+    return _iso_z(dt)
 
 
 def format_timestamp(dt: datetime) -> str:
@@ -213,7 +258,7 @@ def format_timestamp(dt: datetime) -> str:
     """
     if dt.tzinfo is None:
         dt = dt.replace(tzinfo=timezone.utc)
-    return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+    return _iso_z(dt)
 
 
 def parse_timestamp(timestamp_str: str) -> datetime:
@@ -229,11 +274,14 @@ def parse_timestamp(timestamp_str: str) -> datetime:
     Raises:
         ValueError: If the timestamp string is invalid
     """
-    # Handle both 'Z' suffix and '+00:00' format
-    if timestamp_str.endswith("Z"):
-        timestamp_str = timestamp_str[:-1] + "+00:00"
+    # Python 3.11+ parses the 'Z' suffix directly; older versions need '+00:00'
+    try:
+        return datetime.fromisoformat(timestamp_str)
+    except ValueError:
+        if not timestamp_str.endswith("Z"):
+            raise
     
-    return datetime.fromisoformat(timestamp_str)
+    return datetime.fromisoformat(timestamp_str[:-1] + "+00:00")
 
 
 # ============================================================================
@@ -241,6 +289,42 @@ def parse_timestamp(timestamp_str: str) -> datetime:
 # ============================================================================
 
 
+@functools.lru_cache(maxsize=32)
+def _workout_id_layout(
+    num_phases: int,
+    weeks_per_phase: int,
+    days_per_week: int,
+    blocks_per_day: int,
+    exercises_per_block: int
+) -> tuple:
+    """
+    Build the ID prefixes for a plan shape once; only the random parts change per call.
+    
+    Returns:
+        Tuple of (phase_prefix, weeks) where each week is (week_num, week_prefix, days)
+        and each day is (day_num, day_prefix, block_prefixes)
+    """
+    block_prefixes = tuple(f"block_{block_num}_" for block_num in range(1, blocks_per_day + 1))
+    return tuple(
+        (
+            f"phase_{phase_num}_",
+            tuple(
+                (
+                    week_num,
+                    f"w{week_num}_",
+                    tuple(
+                        (day_num, f"w{week_num}_d{day_num}_", block_prefixes)
+                        for day_num in range(1, days_per_week + 1)
+                    )
+                )
+                # Week numbers run continuously across phases
+                for week_num in range((phase_num - 1) * weeks_per_phase + 1, phase_num * weeks_per_phase + 1)
+            )
+        )
+        for phase_num in range(1, num_phases + 1)
+    )
+
+
 def generate_all_workout_ids(
     num_phases: int = 1,
     weeks_per_phase: int = 4,
@@ -266,53 +350,49 @@ def generate_all_workout_ids(
     Example:
         >>> ids = generate_all_workout_ids(num_phases=1, weeks_per_phase=2, days_per_week=3)
         >>> print(ids['workout_id'])
-        'wrk_a1b2c3d4'
+        'wrk_k3xq7mza'
     """
-    ids = {
-        "workout_id": generate_workout_id(),
-        "generated_at": get_current_timestamp(),
-        "phases": []
-    }
+    # Negative counts give empty levels, as range() would
+    num_phases, weeks_per_phase, days_per_week, blocks_per_day, exercises_per_block = (
+        max(count, 0) for count in (num_phases, weeks_per_phase, days_per_week, blocks_per_day, exercises_per_block)
+    )
     
-    week_counter = 1
+    # Draw every random suffix for the plan at once
+    total_ids = 1 + num_phases * (
+        1 + weeks_per_phase * (1 + days_per_week * (1 + blocks_per_day * (1 + exercises_per_block)))
+    )
+    suffixes = _suffix_pool(total_ids)
+    layout = _workout_id_layout(num_phases, weeks_per_phase, days_per_week, blocks_per_day, exercises_per_block)
+    exercise_slots = range(exercises_per_block)
     
-    for phase_num in range(1, num_phases + 1):
-        phase_data = {
-            "id": generate_phase_id(phase_num),
-            "weeks": []
-        }
-        
-        for week_offset in range(weeks_per_phase):
-            week_num = week_counter
-            week_data = {
-                "id": generate_week_id(week_num),
-                "week_number": week_num,
-                "days": []
-            }
-            
-            for day_num in range(1, days_per_week + 1):
-                day_data = {
-                    "id": generate_day_id(week_num, day_num),
-                    "day_number": day_num,
-                    "blocks": []
+    def build_day(day_num: int, day_prefix: str, block_prefixes: tuple) -> dict:
+        return {
+            "id": day_prefix + next(suffixes),
+            "day_number": day_num,
+            "blocks": [
+                {
+                    "id": block_prefix + next(suffixes),
+                    "exercises": [{"id": "ex_" + next(suffixes)} for _ in exercise_slots]
                 }
-                
-                for block_num in range(1, blocks_per_day + 1):
-                    block_data = {
-                        "id": generate_block_id(block_num),
-                        "exercises": [
-                            {"id": generate_exercise_id()}
-                            for _ in range(exercises_per_block)
-                        ]
-                    }
-                    day_data["blocks"].append(block_data)
-                
-                week_data["days"].append(day_data)
-            
-            phase_data["weeks"].append(week_data)
-            week_counter += 1
-        
-        ids["phases"].append(phase_data)
+                for block_prefix in block_prefixes
+            ]
+        }
     
-    return ids
-
+    def build_week(week_num: int, week_prefix: str, days: tuple) -> dict:
+        return {
+            "id": week_prefix + next(suffixes),
+            "week_number": week_num,
+            "days": [build_day(*day) for day in days]
+        }
+    
+    return {
+        "workout_id": "wrk_" + next(suffixes),
+        "generated_at": get_current_timestamp(),
+        "phases": [
+            {
+                "id": phase_prefix + next(suffixes),
+                "weeks": [build_week(*week) for week in weeks]
+            }
+            for phase_prefix, weeks in layout
+        ]
+    }
@@ -5,31 +5,35 @@ Tools for generating and managing workout plans.
 These tools are designed to be used with the Google ADK Agent framework.
 """
 
-import json
+import asyncio
+import functools
+import hashlib
 import logging
+import threading
+import time
+import weakref
+from collections import OrderedDict
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
 
-from pydantic import ValidationError
-from supabase import Client, create_client
+from pydantic import TypeAdapter, ValidationError
+from pydantic_core import from_json, to_json
 
 from ....config import SUPABASE_KEY, SUPABASE_URL
 from ..schemas import (
     AI_WORKOUT_GENERATION_CONTEXT,
     WorkoutPlan,
-    get_example_workout_plan,
+    get_example_workout_plan_json,
 )
 from .utils import (
-    generate_block_id,
-    generate_day_id,
-    generate_exercise_id,
+    generate_all_workout_ids,
     generate_feedback_id,
-    generate_phase_id,
-    generate_week_id,
-    generate_workout_id,
     get_current_timestamp,
 )
 
+if TYPE_CHECKING:
+    from supabase import AsyncClient, Client
+
 # Initialize logger
 logger = logging.getLogger(__name__)
 
@@ -38,15 +42,25 @@ logger = logging.getLogger(__name__)
 # User Profile Pydantic Models (moved from agent.py for reuse)
 # ============================================================================
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, field_validator
+
+
+# Allowed values checked by the UserProfileSchema validators
+_VALID_GENDERS = frozenset({"male", "female", "other", "prefer_not_to_say"})
+_VALID_ACTIVITY_LEVELS = frozenset({"sedentary", "light", "moderate", "active", "athlete"})
+_VALID_TRAINING_EXPERIENCE = frozenset({"beginner", "intermediate", "advanced"})
 
 
 class UserProfileSchema(BaseModel):
     """
     Pydantic model matching the Prisma UserProfile schema.
-    Validates and structures data fetched from Supabase.
+    Validates profile data at trust boundaries such as onboarding writes;
+    the read path in fetch_user_info builds WorkoutUserInfo directly.
     """
 
+    # Unknown Supabase columns are dropped; instances are read-only snapshots
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     id: str
     userId: str
 
@@ -119,32 +133,81 @@ class UserProfileSchema(BaseModel):
     @field_validator("gender")
     @classmethod
     def validate_gender(cls, v):
-        if v and v not in ["male", "female", "other", "prefer_not_to_say"]:
-            logger.warning(f"Unexpected gender value: {v}")
+        if v and v not in _VALID_GENDERS:
+            logger.warning("Unexpected gender value: %s", v)
         return v
 
     @field_validator("activityLevel")
     @classmethod
     def validate_activity_level(cls, v):
-        valid_levels = ["sedentary", "light", "moderate", "active", "athlete"]
-        if v and v not in valid_levels:
-            logger.warning(f"Unexpected activityLevel: {v}")
+        if v and v not in _VALID_ACTIVITY_LEVELS:
+            logger.warning("Unexpected activityLevel: %s", v)
         return v
 
     @field_validator("trainingExperience")
     @classmethod
     def validate_training_experience(cls, v):
-        valid_levels = ["beginner", "intermediate", "advanced"]
-        if v and v not in valid_levels:
-            logger.warning(f"Unexpected trainingExperience: {v}")
+        if v and v not in _VALID_TRAINING_EXPERIENCE:
+            logger.warning("Unexpected trainingExperience: %s", v)
         return v
 
 
+# Display template for WorkoutUserInfo.to_formatted_string, filled via format_map
+_USER_INFO_TEMPLATE = """User Information:
+- User ID: {id}
+- Age: {age}
+- Gender: {gender}
+- Height: {height} cm
+- Weight: {weight} kg
+- Activity Level: {activityLevel}
+- Primary Goal: {primaryGoal}
+- Dietary Preference: {dietaryPreference}
+- Health Conditions: {healthConditions}
+- 30-Day Goal: {thirtyDayGoal}
+
+Body Composition:
+- Body Fat Percentage: {bodyFatPercentage}
+- Waist Circumference: {waistCircumference}
+- Hip Circumference: {hipCircumference}
+- Resting Heart Rate: {restingHeartRate}
+
+Experience & Skills:
+- Training Experience: {trainingExperience}
+- Exercise Familiarity: {exerciseFamiliarity}
+
+Equipment Available:
+- {equipmentAvailable}
+
+Workout Preferences:
+- Workout Days per Week: {workoutDays}
+- Preferred Duration: {workoutDuration}
+- Training Styles: {trainingStyle}
+- Target Body Parts: {targetBodyParts}
+- Exercise Dislikes: {exerciseDislikes}
+
+Lifestyle Factors:
+- Daily Step Count Target: {stepCount}
+- Sleep Hours: {sleepHours}
+- Stress Level: {stressLevel}
+- Work Type: {workType}
+
+Safety & Restrictions:
+- Injuries: {injuries}
+
+Motivation:
+- Motivation Style: {motivationStyle}"""
+
+
 class WorkoutUserInfo(BaseModel):
     """
     Simplified model containing only fields relevant for workout planning.
+
+    Built from trusted database rows with model_construct, so it carries no
+    validators; value sanity checks live on UserProfileSchema for the write path.
     """
 
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     id: str
     age: Optional[int] = None
     gender: Optional[str] = None
@@ -153,7 +216,7 @@ class WorkoutUserInfo(BaseModel):
     activityLevel: Optional[str] = None
     primaryGoal: Optional[str] = None
     dietaryPreference: Optional[str] = None
-    healthConditions: List[str] = Field(default_factory=list)
+    healthConditions: Sequence[str] = ()
     thirtyDayGoal: Optional[str] = None
 
     # Body Composition
@@ -174,9 +237,9 @@ class WorkoutUserInfo(BaseModel):
     workoutDuration: Optional[int] = None
 
     # Training Style & Preferences
-    trainingStyle: List[str] = Field(default_factory=list)
-    targetBodyParts: List[str] = Field(default_factory=list)
-    exerciseDislikes: List[str] = Field(default_factory=list)
+    trainingStyle: Sequence[str] = ()
+    targetBodyParts: Sequence[str] = ()
+    exerciseDislikes: Sequence[str] = ()
 
     # Lifestyle Factors
     stepCount: Optional[int] = None
@@ -190,25 +253,32 @@ class WorkoutUserInfo(BaseModel):
     # Accountability & Motivation
     motivationStyle: Optional[str] = None
 
+    # Display form of healthConditions, joined once at construction
+    _health_str: str = PrivateAttr(default="None reported")
+    # Rendered to_formatted_string output; fields are frozen, so it never goes stale
+    _formatted: Optional[str] = PrivateAttr(default=None)
+
+    def model_post_init(self, __context: Any) -> None:
+        self._health_str = ", ".join(self.healthConditions) or "None reported"
+
     def _format_equipment(self) -> str:
         """Format equipment availability for display."""
         if not self.equipmentAvailable:
             return "Not specified"
-        available = []
-        for equip, value in self.equipmentAvailable.items():
-            if isinstance(value, bool) and value:
-                available.append(equip)
-            elif isinstance(value, dict) and value.get("available"):
-                weight_range = value.get("weightRange", "")
-                available.append(f"{equip} ({weight_range})" if weight_range else equip)
+        available = [
+            f"{equip} ({value['weightRange']})" if isinstance(value, dict) and value.get("weightRange") else equip
+            for equip, value in self.equipmentAvailable.items()
+            if (isinstance(value, bool) and value) or (isinstance(value, dict) and value.get("available"))
+        ]
         return ", ".join(available) if available else "None"
 
     def _format_exercise_familiarity(self) -> str:
         """Format exercise familiarity for display."""
         if not self.exerciseFamiliarity:
             return "Not specified"
-        familiar = [ex for ex, knows in self.exerciseFamiliarity.items() if knows]
-        unfamiliar = [ex for ex, knows in self.exerciseFamiliarity.items() if not knows]
+        familiar, unfamiliar = [], []
+        for ex, knows in self.exerciseFamiliarity.items():
+            (familiar if knows else unfamiliar).append(ex)
         result = []
         if familiar:
             result.append(f"Familiar with: {', '.join(familiar)}")
@@ -220,68 +290,154 @@ class WorkoutUserInfo(BaseModel):
         """Format injuries for display."""
         if not self.injuries:
             return "None reported"
-        injury_strs = []
-        for injury in self.injuries:
-            area = injury.get("area", "Unknown")
-            severity = injury.get("severity", "unknown")
-            notes = injury.get("notes", "")
-            injury_str = f"{area} ({severity})"
-            if notes:
-                injury_str += f" - {notes}"
-            injury_strs.append(injury_str)
-        return "; ".join(injury_strs)
+        return "; ".join(
+            f"{injury.get('area', 'Unknown')} ({injury.get('severity', 'unknown')})"
+            + (f" - {injury['notes']}" if injury.get("notes") else "")
+            for injury in self.injuries
+        )
 
     def to_formatted_string(self) -> str:
         """Convert user info to a readable string format for the agent."""
-        return f"""
-User Information:
-- User ID: {self.id}
-- Age: {self.age if self.age else 'N/A'}
-- Gender: {self.gender if self.gender else 'N/A'}
-- Height: {self.height if self.height else 'N/A'} cm
-- Weight: {self.weight if self.weight else 'N/A'} kg
-- Activity Level: {self.activityLevel if self.activityLevel else 'N/A'}
-- Primary Goal: {self.primaryGoal if self.primaryGoal else 'N/A'}
-- Dietary Preference: {self.dietaryPreference if self.dietaryPreference else 'N/A'}
-- Health Conditions: {', '.join(self.healthConditions) if self.healthConditions else 'None reported'}
-- 30-Day Goal: {self.thirtyDayGoal if self.thirtyDayGoal else 'N/A'}
+        if self._formatted is not None:
+            return self._formatted
+        values = {field: value if value else "N/A" for field, value in self}
+        values.update(
+            healthConditions=self._health_str,
+            bodyFatPercentage=f"{self.bodyFatPercentage}%" if self.bodyFatPercentage else "N/A",
+            waistCircumference=f"{self.waistCircumference} cm" if self.waistCircumference else "N/A",
+            hipCircumference=f"{self.hipCircumference} cm" if self.hipCircumference else "N/A",
+            restingHeartRate=f"{self.restingHeartRate} bpm" if self.restingHeartRate else "N/A",
+            exerciseFamiliarity=self._format_exercise_familiarity(),
+            equipmentAvailable=self._format_equipment(),
+            workoutDuration=f"{self.workoutDuration} minutes" if self.workoutDuration else "N/A",
+            trainingStyle=", ".join(self.trainingStyle) or "Not specified",
+            targetBodyParts=", ".join(self.targetBodyParts) or "Full body",
+            exerciseDislikes=", ".join(self.exerciseDislikes) or "None",
+            sleepHours=f"{self.sleepHours} hours" if self.sleepHours else "N/A",
+            stressLevel=f"{self.stressLevel}/5" if self.stressLevel else "N/A",
+            injuries=self._format_injuries(),
+        )
+        self._formatted = _USER_INFO_TEMPLATE.format_map(values)
+        return self._formatted
 
-Body Composition:
-- Body Fat Percentage: {f'{self.bodyFatPercentage}%' if self.bodyFatPercentage else 'N/A'}
-- Waist Circumference: {f'{self.waistCircumference} cm' if self.waistCircumference else 'N/A'}
-- Hip Circumference: {f'{self.hipCircumference} cm' if self.hipCircumference else 'N/A'}
-- Resting Heart Rate: {f'{self.restingHeartRate} bpm' if self.restingHeartRate else 'N/A'}
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for AI context snapshot."""
+        return self.model_dump(exclude_none=True)
 
-Experience & Skills:
-- Training Experience: {self.trainingExperience if self.trainingExperience else 'N/A'}
-- Exercise Familiarity: {self._format_exercise_familiarity()}
 
-Equipment Available:
-- {self._format_equipment()}
+# Fields WorkoutUserInfo is built from, and the matching UserProfile columns to request.
+# userId is also fetched so the cache can recognise the profile by either identifier.
+WORKOUT_FIELDS: Tuple[str, ...] = tuple(WorkoutUserInfo.model_fields)
+USER_PROFILE_COLUMNS = ",".join(("userId",) + WORKOUT_FIELDS)
 
-Workout Preferences:
-- Workout Days per Week: {self.workoutDays if self.workoutDays else 'N/A'}
-- Preferred Duration: {f'{self.workoutDuration} minutes' if self.workoutDuration else 'N/A'}
-- Training Styles: {', '.join(self.trainingStyle) if self.trainingStyle else 'Not specified'}
-- Target Body Parts: {', '.join(self.targetBodyParts) if self.targetBodyParts else 'Full body'}
-- Exercise Dislikes: {', '.join(self.exerciseDislikes) if self.exerciseDislikes else 'None'}
 
-Lifestyle Factors:
-- Daily Step Count Target: {self.stepCount if self.stepCount else 'N/A'}
-- Sleep Hours: {f'{self.sleepHours} hours' if self.sleepHours else 'N/A'}
-- Stress Level: {f'{self.stressLevel}/5' if self.stressLevel else 'N/A'}
-- Work Type: {self.workType if self.workType else 'N/A'}
+# ============================================================================
+# Supabase Client
+# ============================================================================
 
-Safety & Restrictions:
-- Injuries: {self._format_injuries()}
 
-Motivation:
-- Motivation Style: {self.motivationStyle if self.motivationStyle else 'N/A'}
-        """.strip()
+@functools.lru_cache(maxsize=1)
+def _get_supabase_client() -> "Client":
+    """
+    Return the shared Supabase client, creating it on first use.
 
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for AI context snapshot."""
-        return self.model_dump(exclude_none=True)
+    Network clients are built once per process and reused across tool calls
+    (like the shared Vertex AI client in the journal agent), so the
+    underlying HTTP session and its pooled connections are not rebuilt on
+    every invocation. supabase is imported here so agent startup does not pay
+    for it until the first workout plan is saved.
+    """
+    from supabase import create_client
+
+    return create_client(SUPABASE_URL, SUPABASE_KEY)
+
+
+# The async client's httpx session binds to the event loop that first uses it, so
+# one client (and the lock guarding its creation) is kept per running loop. Entries
+# go away with their loop, e.g. when asyncio.run() finishes.
+_async_supabase_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+_async_supabase_client_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+async def _get_async_supabase_client() -> "AsyncClient":
+    """
+    Return the async Supabase client for the running event loop, creating it on first use.
+
+    Used by async tools so the Supabase round-trip does not block the agent's
+    event loop; the per-loop lock keeps concurrent first calls from creating two clients.
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_supabase_clients.get(loop)
+    if client is None:
+        lock = _async_supabase_client_locks.setdefault(loop, asyncio.Lock())
+        async with lock:
+            client = _async_supabase_clients.get(loop)
+            if client is None:
+                from supabase import acreate_client
+
+                client = await acreate_client(SUPABASE_URL, SUPABASE_KEY)
+                _async_supabase_clients[loop] = client
+                # The lock refers back to its loop, so keeping it would pin the entry
+                _async_supabase_client_locks.pop(loop, None)
+    return client
+
+
+# ============================================================================
+# User Info Cache
+# ============================================================================
+
+# Profiles rarely change within a conversation, but fetch_user_info is called on
+# most turns. Formatted results are kept in a small TTL + LRU cache keyed by the
+# profile's id. fetch_user_info accepts either id or userId, so every identifier a
+# profile is known by maps to that one entry, and invalidating through any of them
+# drops it.
+USER_INFO_CACHE_TTL_SECONDS = 300
+USER_INFO_CACHE_MAX_ENTRIES = 1024
+
+# profile id -> (cached_at, formatted profile, identifiers that map to it)
+_user_info_cache: "OrderedDict[str, Tuple[float, str, Tuple[str, ...]]]" = OrderedDict()
+# id, userId or any identifier the agent passed -> profile id
+_user_info_aliases: Dict[str, str] = {}
+_user_info_cache_lock = threading.Lock()
+
+
+def _drop_cached_user_info(profile_id: str) -> None:
+    """Remove a cached profile and its identifiers; the caller holds the lock."""
+    entry = _user_info_cache.pop(profile_id, None)
+    if entry is not None:
+        for alias in entry[2]:
+            if _user_info_aliases.get(alias) == profile_id:
+                del _user_info_aliases[alias]
+
+
+def _get_cached_user_info(identifier: str) -> Optional[str]:
+    """Return the cached formatted profile known by identifier if it has not expired."""
+    with _user_info_cache_lock:
+        profile_id = _user_info_aliases.get(identifier)
+        if profile_id is None:
+            return None
+        cached_at, formatted, _ = _user_info_cache[profile_id]
+        if time.monotonic() - cached_at >= USER_INFO_CACHE_TTL_SECONDS:
+            _drop_cached_user_info(profile_id)
+            return None
+        _user_info_cache.move_to_end(profile_id)
+        return formatted
+
+
+def _set_cached_user_info(profile_id: str, identifiers: Tuple[str, ...], formatted: str) -> None:
+    """Store a formatted profile under its id, evicting the least recently used entry when full."""
+    with _user_info_cache_lock:
+        _drop_cached_user_info(profile_id)
+        aliases = tuple(dict.fromkeys((profile_id,) + identifiers))
+        _user_info_cache[profile_id] = (time.monotonic(), formatted, aliases)
+        for alias in aliases:
+            _user_info_aliases[alias] = profile_id
+        while len(_user_info_cache) > USER_INFO_CACHE_MAX_ENTRIES:
+            _drop_cached_user_info(next(iter(_user_info_cache)))
 
 
 # ============================================================================
@@ -289,83 +445,94 @@ Motivation:
 # ============================================================================
 
 
-def fetch_user_info(user_id: str) -> str:
+def _quote_filter_value(value: str) -> str:
     """
-    Fetch user information from Supabase database with Pydantic validation.
+    Quote a value for a PostgREST or= filter string.
+
+    .or_() takes raw filter syntax, so an unquoted id containing ',', '.', ':' or
+    parentheses could add conditions of its own (e.g. 'x,id.neq.null' would match
+    every row). Inside double quotes those characters are literal; only '"' and
+    '\\' need escaping.
+    """
+    escaped = value.replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+async def fetch_user_info(user_id: str) -> str:
+    """
+    Fetch user information from Supabase database.
 
     Args:
         user_id: The unique identifier for the user (can be userId or id)
 
     Returns:
-        String containing validated user information including fitness goals, preferences, etc.
+        String containing user information including fitness goals, preferences, etc.
     """
-    try:
-        supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+    cached = _get_cached_user_info(user_id)
+    if cached is not None:
+        return cached
 
-        response = supabase.table("UserProfile").select("*").eq("userId", user_id).execute()
+    try:
+        supabase = await _get_async_supabase_client()
+        quoted_id = _quote_filter_value(user_id)
+
+        # Match either column in a single round-trip; maybe_single returns the row
+        # itself rather than a one-element list
+        response = await (
+            supabase.table("UserProfile")
+            .select(USER_PROFILE_COLUMNS)
+            .or_(f"userId.eq.{quoted_id},id.eq.{quoted_id}")
+            .limit(1)
+            .maybe_single()
+            .execute()
+        )
 
-        if not response.data or len(response.data) == 0:
-            logger.warning(f"No user profile found with userId or id: {user_id}")
+        # Depending on the postgrest version, a missing row yields None or data=None
+        if response is None or response.data is None:
+            logger.warning("No user profile found with userId or id: %s", user_id)
             return f"Error: User profile not found with identifier: {user_id}"
 
-        user_data = response.data[0]
-        logger.info(f"Successfully fetched user profile for: {user_id}")
+        user_data = response.data
+        logger.info("Successfully fetched user profile for: %s", user_id)
 
-        # Validate and parse data using Pydantic
-        try:
-            full_profile = UserProfileSchema.model_validate(user_data)
-
-            # Extract workout-relevant fields
-            workout_info = WorkoutUserInfo(
-                id=full_profile.id,
-                age=full_profile.age,
-                gender=full_profile.gender,
-                height=full_profile.height,
-                weight=full_profile.weight,
-                activityLevel=full_profile.activityLevel,
-                primaryGoal=full_profile.primaryGoal,
-                dietaryPreference=full_profile.dietaryPreference,
-                healthConditions=full_profile.healthConditions,
-                thirtyDayGoal=full_profile.thirtyDayGoal,
-                # Body Composition
-                bodyFatPercentage=full_profile.bodyFatPercentage,
-                waistCircumference=full_profile.waistCircumference,
-                hipCircumference=full_profile.hipCircumference,
-                restingHeartRate=full_profile.restingHeartRate,
-                # Experience & Skill Level
-                trainingExperience=full_profile.trainingExperience,
-                exerciseFamiliarity=full_profile.exerciseFamiliarity,
-                # Equipment Availability
-                equipmentAvailable=full_profile.equipmentAvailable,
-                # Workout Schedule & Preferences
-                workoutDays=full_profile.workoutDays,
-                workoutDuration=full_profile.workoutDuration,
-                # Training Style & Preferences
-                trainingStyle=full_profile.trainingStyle,
-                targetBodyParts=full_profile.targetBodyParts,
-                exerciseDislikes=full_profile.exerciseDislikes,
-                # Lifestyle Factors
-                stepCount=full_profile.stepCount,
-                sleepHours=full_profile.sleepHours,
-                stressLevel=full_profile.stressLevel,
-                workType=full_profile.workType,
-                # Restrictions & Safety
-                injuries=full_profile.injuries,
-                # Accountability & Motivation
-                motivationStyle=full_profile.motivationStyle,
-            )
-
-            return workout_info.to_formatted_string()
-
-        except Exception as validation_error:
-            logger.error(f"Pydantic validation error: {str(validation_error)}")
-            return f"Warning: Data validation failed. Raw data: {user_data}"
+        # Validation is intentionally skipped: the row already conformed to the Prisma
+        # UserProfile schema on insert. NULL columns are dropped so model defaults apply.
+        workout_info = WorkoutUserInfo.model_construct(
+            **{field: user_data[field] for field in WORKOUT_FIELDS if user_data.get(field) is not None}
+        )
+
+        formatted = workout_info.to_formatted_string()
+        identifiers = tuple(alias for alias in (user_id, user_data.get("userId")) if alias)
+        _set_cached_user_info(user_data["id"], identifiers, formatted)
+        return formatted
 
     except Exception as e:
-        logger.error(f"Error fetching user info for user_id {user_id}: {str(e)}")
+        logger.error("Error fetching user info for user_id %s: %s", user_id, e)
         return f"Error: Failed to fetch user info - {str(e)}"
 
 
+def clear_user_info_cache(user_id: Optional[str] = None) -> str:
+    """
+    Clear cached user profile information so the next fetch reads fresh data.
+
+    Use this tool when the user says they have updated their profile
+    (e.g., new weight, goals, or equipment) during the conversation.
+
+    Args:
+        user_id: The userId or id to invalidate. If omitted, the whole cache is cleared.
+
+    Returns:
+        String confirming what was cleared
+    """
+    with _user_info_cache_lock:
+        if user_id is None:
+            _user_info_cache.clear()
+            _user_info_aliases.clear()
+            return "✅ Cleared all cached user profiles."
+        _drop_cached_user_info(_user_info_aliases.get(user_id, user_id))
+    return f"✅ Cleared cached profile for: {user_id}"
+
+
 def generate_workout_plan_ids(
     num_phases: int = 1,
     weeks_per_phase: int = 4,
@@ -389,44 +556,51 @@ def generate_workout_plan_ids(
     Returns:
         JSON string containing all generated IDs organized by structure
     """
-    ids = {
-        "workout_id": generate_workout_id(),
-        "generated_at": get_current_timestamp(),
-        "phases": [],
-    }
-
-    week_counter = 1
-
-    for phase_num in range(1, num_phases + 1):
-        phase_data = {"phase_id": generate_phase_id(phase_num), "phase_number": phase_num, "weeks": []}
-
-        for _ in range(weeks_per_phase):
-            week_num = week_counter
-            week_data = {"week_id": generate_week_id(week_num), "week_number": week_num, "days": []}
-
-            for day_num in range(1, days_per_week + 1):
-                day_data = {
-                    "day_id": generate_day_id(week_num, day_num),
-                    "day_number": day_num,
-                    "blocks": [],
+    # Reuse the shared builder (one suffix draw, cached per-shape prefixes) and only
+    # rename its keys to the layout this tool has always returned
+    tree = generate_all_workout_ids(
+        num_phases=num_phases,
+        weeks_per_phase=weeks_per_phase,
+        days_per_week=days_per_week,
+        blocks_per_day=blocks_per_day,
+        exercises_per_block=exercises_per_block,
+    )
+
+    def remap_day(day: dict) -> dict:
+        return {
+            "day_id": day["id"],
+            "day_number": day["day_number"],
+            "blocks": [
+                {
+                    "block_id": block["id"],
+                    "block_number": block_num,
+                    "exercise_ids": [exercise["id"] for exercise in block["exercises"]],
                 }
+                for block_num, block in enumerate(day["blocks"], 1)
+            ],
+        }
 
-                for block_num in range(1, blocks_per_day + 1):
-                    block_data = {
-                        "block_id": generate_block_id(block_num),
-                        "block_number": block_num,
-                        "exercise_ids": [generate_exercise_id() for _ in range(exercises_per_block)],
+    ids = {
+        "workout_id": tree["workout_id"],
+        "generated_at": tree["generated_at"],
+        "phases": [
+            {
+                "phase_id": phase["id"],
+                "phase_number": phase_num,
+                "weeks": [
+                    {
+                        "week_id": week["id"],
+                        "week_number": week["week_number"],
+                        "days": [remap_day(day) for day in week["days"]],
                     }
-                    day_data["blocks"].append(block_data)
-
-                week_data["days"].append(day_data)
-
-            phase_data["weeks"].append(week_data)
-            week_counter += 1
-
-        ids["phases"].append(phase_data)
+                    for week in phase["weeks"]
+                ],
+            }
+            for phase_num, phase in enumerate(tree["phases"], 1)
+        ],
+    }
 
-    return json.dumps(ids, indent=2)
+    return to_json(ids, indent=2).decode()
 
 
 def get_workout_schema_info() -> str:
@@ -438,13 +612,18 @@ def get_workout_schema_info() -> str:
     Returns:
         String containing the schema documentation and an example workout plan structure
     """
-    example = get_example_workout_plan()
-    
+    return _workout_schema_info_text()
+
+
+# Kept as a private helper so the ADK tool itself stays a plain function
+@functools.cache
+def _workout_schema_info_text() -> str:
+    """Build the schema info text once; every input to it is a module constant."""
     return f"""
 {AI_WORKOUT_GENERATION_CONTEXT}
 
 EXAMPLE WORKOUT PLAN STRUCTURE:
-{json.dumps(example, indent=2, default=str)}
+{get_example_workout_plan_json()}
 
 AVAILABLE ID GENERATION FUNCTIONS:
 - Workout Plan ID: Use format 'wrk_xxxxxxxx'
@@ -481,10 +660,10 @@ def _parse_workout_input(workout_input) -> dict:
     
     # If it's a string, try different parsing methods
     if isinstance(workout_input, str):
-        # First, try standard JSON parsing
+        # First, try JSON parsing with pydantic-core's Rust parser
         try:
-            return json.loads(workout_input)
-        except json.JSONDecodeError:
+            return from_json(workout_input)
+        except ValueError:
             pass
         
         # Try parsing as Python literal (handles True/False instead of true/false)
@@ -503,6 +682,45 @@ def _parse_workout_input(workout_input) -> dict:
     raise ValueError(f"Unsupported workout input type: {type(workout_input)}")
 
 
+# Built once at import so every validation reuses the same compiled validator
+_WORKOUT_PLAN_ADAPTER = TypeAdapter(WorkoutPlan)
+
+# Plans that already passed full validation, keyed by a digest of their JSON. The
+# agent validates a plan and then passes the same JSON to the review and save
+# tools, which get the validated object back without another tree walk. Tools
+# only read validated plans, so sharing one instance between calls is safe.
+VALIDATED_PLAN_CACHE_MAX_ENTRIES = 32
+
+_validated_plans: "OrderedDict[str, WorkoutPlan]" = OrderedDict()
+_validated_plans_lock = threading.Lock()
+
+
+def _plan_fingerprint(plan_data: dict) -> str:
+    """Return a digest of the plan JSON; key order is kept, so reordered plans just miss."""
+    encoded = to_json(plan_data, fallback=str)
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+def _load_workout_plan(plan_data: dict) -> WorkoutPlan:
+    """
+    Return the WorkoutPlan for parsed JSON, validating it only if this exact plan
+    has not been validated before.
+    """
+    fingerprint = _plan_fingerprint(plan_data)
+    with _validated_plans_lock:
+        cached_plan = _validated_plans.get(fingerprint)
+        if cached_plan is not None:
+            _validated_plans.move_to_end(fingerprint)
+            return cached_plan
+
+    validated_plan = _WORKOUT_PLAN_ADAPTER.validate_python(plan_data)
+    with _validated_plans_lock:
+        _validated_plans[fingerprint] = validated_plan
+        while len(_validated_plans) > VALIDATED_PLAN_CACHE_MAX_ENTRIES:
+            _validated_plans.popitem(last=False)
+    return validated_plan
+
+
 def validate_workout_plan(workout_plan: dict) -> str:
     """
     Validate a workout plan against the schema.
@@ -520,23 +738,11 @@ def validate_workout_plan(workout_plan: dict) -> str:
         plan_data = _parse_workout_input(workout_plan)
         
         # Validate against Pydantic model
-        validated_plan = WorkoutPlan.model_validate(plan_data)
+        validated_plan = _load_workout_plan(plan_data)
         
         # Generate summary statistics
         total_phases = len(validated_plan.phases)
-        total_weeks = sum(len(phase.weeks) for phase in validated_plan.phases)
-        total_days = sum(
-            len(week.days) 
-            for phase in validated_plan.phases 
-            for week in phase.weeks
-        )
-        total_exercises = sum(
-            len(block.exercises)
-            for phase in validated_plan.phases
-            for week in phase.weeks
-            for day in week.days
-            for block in day.blocks
-        )
+        total_weeks, total_days, total_exercises = validated_plan.structure_counts
         
         return f"""
 ✅ Workout plan is VALID!
@@ -557,9 +763,6 @@ Structure:
 The plan is ready to be saved to the database.
 """
     
-    except json.JSONDecodeError as e:
-        return f"❌ Invalid JSON format: {str(e)}"
-    
     except ValidationError as e:
         error_messages = []
         for error in e.errors():
@@ -605,10 +808,10 @@ def save_workout_plan(user_id: str, workout_plan: dict) -> str:
     try:
         # Parse the input using the robust parser
         plan_data = _parse_workout_input(workout_plan)
-        validated_plan = WorkoutPlan.model_validate(plan_data)
+        validated_plan = _load_workout_plan(plan_data)
         
         # Connect to Supabase
-        supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+        supabase = _get_supabase_client()
         
         # Prepare the data for insertion
         workout_record = {
@@ -622,7 +825,7 @@ def save_workout_plan(user_id: str, workout_plan: dict) -> str:
         if response.data:
             first_record = response.data[0]
             workout_id = first_record["id"] if isinstance(first_record, dict) else "unknown"
-            logger.info(f"Successfully saved workout plan {validated_plan.id} for user {user_id}")
+            logger.info("Successfully saved workout plan %s for user %s", validated_plan.id, user_id)
             return f"""
 ✅ Workout plan saved successfully!
 
@@ -637,14 +840,11 @@ The workout plan is now available in the user's account.
         else:
             return "❌ Failed to save workout plan: No data returned from database"
             
-    except json.JSONDecodeError as e:
-        return f"❌ Invalid JSON format: {str(e)}"
-    
     except ValidationError as e:
         return f"❌ Workout plan validation failed. Please validate the plan first using validate_workout_plan tool."
     
     except Exception as e:
-        logger.error(f"Error saving workout plan: {str(e)}")
+        logger.error("Error saving workout plan: %s", e)
         return f"❌ Failed to save workout plan: {str(e)}"
 
 
@@ -655,6 +855,14 @@ The workout plan is now available in the user's account.
 # In-memory storage for the current workout plan (to avoid passing huge JSON repeatedly)
 _current_workout_plan_cache: Dict[str, WorkoutPlan] = {}
 
+BLOCK_TYPE_EMOJI = {
+    "straight": "➡️",
+    "superset": "🔄",
+    "circuit": "🔁",
+    "emom": "⏰",
+    "amrap": "💥",
+}
+
 
 def format_workout_plan_for_review(workout_plan: dict) -> str:
     """
@@ -676,7 +884,7 @@ def format_workout_plan_for_review(workout_plan: dict) -> str:
     try:
         # Parse the input using the robust parser
         plan_data = _parse_workout_input(workout_plan)
-        validated_plan = WorkoutPlan.model_validate(plan_data)
+        validated_plan = _load_workout_plan(plan_data)
         
         # Cache the plan for detailed viewing later
         _current_workout_plan_cache["current"] = validated_plan
@@ -698,28 +906,26 @@ def format_workout_plan_for_review(workout_plan: dict) -> str:
             
             for week in phase.weeks:
                 deload_tag = " 🔄 DELOAD" if week.is_deload else ""
-                training_days = sum(1 for d in week.days if not d.rest_day)
-                rest_days = sum(1 for d in week.days if d.rest_day)
                 
-                # Count unique exercises across the week
-                all_exercises = []
+                # Count training days and exercises in one pass over the week
+                training_days = 0
+                exercise_count = 0
                 for day in week.days:
                     if not day.rest_day:
-                        for block in day.blocks:
-                            all_exercises.extend([ex.name for ex in block.exercises])
+                        training_days += 1
+                        exercise_count += sum(len(block.exercises) for block in day.blocks)
+                rest_days = len(week.days) - training_days
+                
+                # Show day names only (not full details)
+                schedule = " | ".join(
+                    f"D{day.day_number}:Rest" if day.rest_day else f"D{day.day_number}:{day.name[:15]}"
+                    for day in week.days
+                )
                 
                 output.append(f"\n   📅 Week {week.week_number}: {week.focus}{deload_tag}")
                 output.append(f"      {training_days} training days, {rest_days} rest days")
-                output.append(f"      {len(all_exercises)} exercises total")
-                
-                # Show day names only (not full details)
-                day_summaries = []
-                for day in week.days:
-                    if day.rest_day:
-                        day_summaries.append(f"D{day.day_number}:Rest")
-                    else:
-                        day_summaries.append(f"D{day.day_number}:{day.name[:15]}")
-                output.append(f"      Schedule: {' | '.join(day_summaries)}")
+                output.append(f"      {exercise_count} exercises total")
+                output.append(f"      Schedule: {schedule}")
         
         # Show first week details as a sample
         output.append(f"\n{'═' * 60}")
@@ -736,14 +942,7 @@ def format_workout_plan_for_review(workout_plan: dict) -> str:
                     output.append(f"   Targets: {', '.join(day.muscle_groups)}")
                     
                     for block in day.blocks:
-                        block_type_emoji = {
-                            "straight": "➡️",
-                            "superset": "🔄",
-                            "circuit": "🔁",
-                            "emom": "⏰",
-                            "amrap": "💥"
-                        }
-                        output.append(f"\n      {block_type_emoji.get(block.type, '•')} {block.type.upper()} Block:")
+                        output.append(f"\n      {BLOCK_TYPE_EMOJI.get(block.type, '•')} {block.type.upper()} Block:")
                         
                         for ex in block.exercises:
                             output.append(f"         • {ex.name} - {len(ex.sets)} sets")
@@ -763,8 +962,6 @@ def format_workout_plan_for_review(workout_plan: dict) -> str:
         
         return "\n".join(output)
         
-    except json.JSONDecodeError as e:
-        return f"❌ Error parsing workout plan JSON: {str(e)}"
     except ValidationError as e:
         return f"❌ Invalid workout plan structure: {str(e)}"
     except Exception as e:
@@ -822,14 +1019,7 @@ def format_workout_week_details(week_number: int) -> str:
                 output.append(f"Duration: {day.target_duration} min | Targets: {', '.join(day.muscle_groups)}")
                 
                 for block in day.blocks:
-                    block_type_emoji = {
-                        "straight": "➡️",
-                        "superset": "🔄",
-                        "circuit": "🔁",
-                        "emom": "⏰",
-                        "amrap": "💥"
-                    }
-                    output.append(f"\n   {block_type_emoji.get(block.type, '•')} {block.type.upper()} Block:")
+                    output.append(f"\n   {BLOCK_TYPE_EMOJI.get(block.type, '•')} {block.type.upper()} Block:")
                     
                     for ex in block.exercises:
                         output.append(f"\n      • {ex.name}")
@@ -860,6 +1050,20 @@ def format_workout_week_details(week_number: int) -> str:
         return f"❌ Error showing week details: {str(e)}"
 
 
+def _plan_counts(plan: dict) -> Tuple[int, int]:
+    """Return (exercise count, workout day count) for a raw plan dict in one traversal."""
+    exercise_count = 0
+    workout_days = 0
+    for phase in plan.get("phases", ()):
+        for week in phase.get("weeks", ()):
+            for day in week.get("days", ()):
+                if not day.get("restDay", False):
+                    workout_days += 1
+                for block in day.get("blocks", ()):
+                    exercise_count += len(block.get("exercises", ()))
+    return exercise_count, workout_days
+
+
 def summarize_workout_changes(original_plan: dict, updated_plan: dict) -> str:
     """
     Compare two workout plans and summarize what changed.
@@ -890,18 +1094,9 @@ def summarize_workout_changes(original_plan: dict, updated_plan: dict) -> str:
         if original.get("difficulty") != updated.get("difficulty"):
             changes.append(f"💪 Difficulty: {original.get('difficulty')} → {updated.get('difficulty')}")
         
-        # Count exercises in each plan
-        def count_exercises(plan):
-            count = 0
-            for phase in plan.get("phases", []):
-                for week in phase.get("weeks", []):
-                    for day in week.get("days", []):
-                        for block in day.get("blocks", []):
-                            count += len(block.get("exercises", []))
-            return count
-        
-        orig_ex_count = count_exercises(original)
-        upd_ex_count = count_exercises(updated)
+        # Count exercises and workout days in each plan
+        orig_ex_count, orig_days = _plan_counts(original)
+        upd_ex_count, upd_days = _plan_counts(updated)
         
         if orig_ex_count != upd_ex_count:
             diff = upd_ex_count - orig_ex_count
@@ -910,19 +1105,6 @@ def summarize_workout_changes(original_plan: dict, updated_plan: dict) -> str:
             else:
                 changes.append(f"➖ Removed {abs(diff)} exercise(s)")
         
-        # Count workout days
-        def count_workout_days(plan):
-            count = 0
-            for phase in plan.get("phases", []):
-                for week in phase.get("weeks", []):
-                    for day in week.get("days", []):
-                        if not day.get("restDay", False):
-                            count += 1
-            return count
-        
-        orig_days = count_workout_days(original)
-        upd_days = count_workout_days(updated)
-        
         if orig_days != upd_days:
             changes.append(f"📅 Workout days: {orig_days} → {upd_days}")
         
@@ -941,6 +1123,7 @@ def summarize_workout_changes(original_plan: dict, updated_plan: dict) -> str:
 
 WORKOUT_AGENT_TOOLS = [
     fetch_user_info,
+    clear_user_info_cache,
     generate_workout_plan_ids,
     get_workout_schema_info,
     validate_workout_plan,
@@ -4,6 +4,7 @@ from typing import Any, Optional
 class _AgentEngineMemories:
     def create(self, *args: Any, **kwargs: Any) -> Any: ...
     def generate(self, *args: Any, **kwargs: Any) -> Any: ...
+    def retrieve(self, *args: Any, **kwargs: Any) -> Any: ...
 
 
 class _AgentEngines: